@@ -0,0 +1 @@
+"""Shared configuration, price data, and LLM helpers for the BitBot entry points."""
@@ -0,0 +1,133 @@
+import os
+import re
+import time
+import logging
+import threading
+from typing import NamedTuple
+from functools import lru_cache
+from cachetools import TTLCache
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# === Configuration ===
+BOT_NAME = os.getenv("BOT_NAME", "BitBot")
+GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+LLM_MODEL = os.getenv("LLM_MODEL", "llama3-8b-8192")
+
+# === Logging ===
+logger = logging.getLogger(__name__)
+
+# A bad LLM_TIMEOUT must not stop the app from starting; fall back instead
+try:
+    LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "10"))
+except ValueError:
+    logger.warning("Invalid LLM_TIMEOUT %r; using 10 seconds", os.getenv("LLM_TIMEOUT"))
+    LLM_TIMEOUT = 10.0
+
+# === LLM Setup ===
+@lru_cache(maxsize=1)
+def get_llm():
+    # Built, and LangChain imported, on first use so price-only sessions
+    # never pay for either
+    from langchain_groq import ChatGroq
+    
+    # Bound each call and retry a rate limit only once, so a stalled or
+    # throttled API surfaces the fallback reply instead of hanging the chat
+    return ChatGroq(
+        api_key=GROQ_API_KEY,
+        model_name=LLM_MODEL,
+        timeout=LLM_TIMEOUT,
+        max_retries=1
+    )
+
+# Replies keyed by the exact prompt (a string or a tuple of (role, content)
+# messages); failures and empty replies are never cached.
+# Streamlit serves sessions from several threads, so access is locked.
+llm_cache = TTLCache(maxsize=512, ttl=3600)
+_llm_cache_lock = threading.Lock()
+
+# === Hardcoded price data ===
+class PriceEntry(NamedTuple):
+    price: float
+    change: float
+    symbol: str
+    color: str
+
+price_data = {
+    "bitcoin": PriceEntry(43500.0, 1.2, "₿", "#f7931a"),
+    "ethereum": PriceEntry(3250.0, -0.5, "Ξ", "#627eea"),
+    "cardano": PriceEntry(0.62, 0.8, "₳", "#0033ad"),
+}
+# Refresh alongside price_data whenever the table is reloaded; readers go
+# through the module attribute so they see the new value
+price_data_updated = time.strftime("%H:%M:%S")
+
+# === Keyword Dispatch ===
+# Whole-message commands that show the usage hints
+HELP_COMMANDS = frozenset({"help", "commands"})
+
+# Dispatch keywords mapped to their category, matched in one regex pass per message
+_KEYWORDS = {
+    **{coin: "coin" for coin in price_data},
+    **dict.fromkeys(("chart", "graph", "trend", "history"), "chart"),
+    **dict.fromkeys(("price", "how much", "value"), "price"),
+}
+_KEYWORD_RE = re.compile("|".join(map(re.escape, _KEYWORDS)))
+
+def scan_keywords(text: str) -> dict:
+    """Map each keyword category found in lowercased text to its first matching keyword."""
+    hits = {}
+    for match in _KEYWORD_RE.finditer(text):
+        hits.setdefault(_KEYWORDS[match.group(0)], match.group(0))
+    return hits
+
+# === LLM Helpers ===
+def _cached_response(prompt):
+    with _llm_cache_lock:
+        return llm_cache.get(prompt)
+
+def _store_response(prompt, response: str):
+    # An empty reply is a failure from the user's side; let the next ask retry
+    if not response:
+        return
+    with _llm_cache_lock:
+        llm_cache[prompt] = response
+
+def get_llm_response(prompt) -> str:
+    cached = _cached_response(prompt)
+    if cached is not None:
+        return cached
+    try:
+        result = get_llm().invoke(prompt)
+        content = getattr(result, "content", None)
+        if content is not None:
+            response = content.strip()
+        else:
+            response = str(result).strip()
+        _store_response(prompt, response)
+        return response
+    except Exception as e:
+        logger.error("Groq LLM error: %s", e)
+        return "I'm having trouble thinking right now. Try again shortly."
+
+def stream_llm_response(prompt):
+    """Yield the LLM reply chunk by chunk as Groq generates it."""
+    cached = _cached_response(prompt)
+    if cached is not None:
+        yield cached
+        return
+    chunks = []
+    try:
+        for chunk in get_llm().stream(prompt):
+            chunks.append(chunk.content)
+            yield chunk.content
+    except Exception as e:
+        logger.error("Groq LLM error: %s", e)
+        # Keep the fallback off the line of any partial reply already shown
+        if chunks:
+            yield "\n"
+        yield "I'm having trouble thinking right now. Try again shortly."
+        return
+    _store_response(prompt, "".join(chunks).strip())